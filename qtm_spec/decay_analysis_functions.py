@@ -14,49 +14,83 @@
 
 ''' Functions for analyzing bright state decay data from Quantinuum. '''
 
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Optional
+
 import numpy as np
 from scipy.optimize import curve_fit
-from scipy.special import  erf
 
-from .loading_functions import load_data
+from .fitting_functions import basic_bootstrap_interval, batched_curve_fit
+from .loading_functions import load_data, survival_arrays
+
+_rng = np.random.default_rng()
 
 
 def decay_analysis(data_dir: str, 
                    machine: str, 
                    date: str, 
-                   decay_type: str):
+                   decay_type: str,
+                   seed: Optional[int] = None,
+                   max_workers: Optional[int] = 1):
     ''' Analyze bright decay data and return DataFrame of results. '''
 
     data = load_data(data_dir, machine, date, decay_type)
 
+    # independent random streams so results don't depend on max_workers
+    rngs = [
+        np.random.default_rng(s)
+        for s in np.random.SeedSequence(seed).spawn(len(data['survival']))
+    ]
+    analyze = partial(_analyze_qubit, shots=data['shots'])
+    args = (data['survival'].keys(), data['survival'].values(), rngs)
+    if max_workers == 1:
+        results = list(map(analyze, *args))
+    else:
+        with ProcessPoolExecutor(max_workers) as executor:
+            results = list(executor.map(analyze, *args))
+
     fit_info = {}
     boot_info = {}
-    for q in data['survival']:
-        xvals = list(data['survival'][q].keys())
-        yvals = [
-            val/data['shots']
-            for val in data['survival'][q].values()
-        ]
-        fit_info[q] = decay_fit(
-            xvals, 
-            yvals,
-        )
-        boot_info[q] = bootstrap(
-            data['survival'][q], 
-            data['shots'], 
-        )
+    for q, fit, boot in results:
+        fit_info[q] = fit
+        boot_info[q] = boot
     return fit_info, boot_info
 
 
+def _analyze_qubit(q: str,
+                   survival: dict,
+                   rng: np.random.Generator,
+                   shots: int):
+    ''' Fit and bootstrap the decay of a single qubit. '''
+
+    xvals, counts = survival_arrays(survival)
+    yvals = counts/shots
+    fit = decay_fit(
+        xvals, 
+        yvals,
+    )
+    boot = bootstrap(
+        survival, 
+        shots, 
+        rng=rng
+    )
+    return q, fit, boot
+
+
 def decay_fit(xvals: list,
               yvals: list):
     ''' Fit data to theoretical bright state population to get rate. '''
 
     fit = curve_fit(
         bright_state_population,
-        xvals,
+        np.asarray(xvals, dtype=np.float64),
         yvals,
-        p0=[1, 0.001]
+        p0=[1, 0.001],
+        method='lm',
+        jac=lambda m, spam, gamma: np.column_stack(
+            bright_state_jacobian(m, spam, gamma)
+        )
     )
     metrics = convert_params(fit[0])
 
@@ -90,28 +124,47 @@ def bright_state_population(m: int, spam:float, gamma: float):
     return (1/3) * (2 - spam + np.exp(-3*gamma*m)*(-2 + 4 * spam))
 
 
+def bright_state_jacobian(m: int, spam: float, gamma: float):
+    ''' Derivatives of bright state population w.r.t. spam and gamma. '''
+
+    decay = np.exp(-3*gamma*m)
+    return (4*decay - 1)/3, m * decay * (2 - 4 * spam)
+
+
 def bootstrap(survival: dict,
               shots: int, 
-              resamples: int = 1000):
+              resamples: int = 1000,
+              rng: Optional[np.random.Generator] = None):
     ''' Parametric bootstrap resample for bright state decay. '''
 
-    xvals = [int(m) for m in survival]
-    yvals = [val/shots for val in survival.values()]
+    if rng is None:
+        rng = _rng
 
-    resample = np.random.binomial(
+    xvals, counts = survival_arrays(survival)
+    yvals = counts/shots
+
+    resample = rng.binomial(
             shots, 
             yvals,
-            size=[resamples, len(yvals)]
-    )/shots
-    boot_sample = np.array([
-        decay_fit(xvals, resample[r, :])
-        for r in range(resamples)
-    ])
-    thresh = 1/2 + erf(1/np.sqrt(2))/2
-    uncertainty ={
-        'SPAM lower': 2*np.mean(boot_sample[:,0]) - np.quantile(boot_sample[:,0], thresh),
-        'SPAM upper': 2*np.mean(boot_sample[:,0]) - np.quantile(boot_sample[:,0], 1-thresh),
-        'Avg. fidelity lower': 2*np.mean(boot_sample[:,1]) - np.quantile(boot_sample[:,1], thresh),
-        'Avg. fidelity upper': 2*np.mean(boot_sample[:,1]) - np.quantile(boot_sample[:,1], 1-thresh)
+            size=(resamples, len(yvals))
+    ).astype(np.float64)
+    resample /= shots
+
+    # all resamples start from the fit to the measured data
+    p0 = convert_metrics(decay_fit(xvals, yvals))
+    fit_params = batched_curve_fit(
+        bright_state_population,
+        bright_state_jacobian,
+        xvals,
+        resample,
+        p0
+    )
+    boot_sample = np.array(convert_params(fit_params.T)).T
+    lower, upper = basic_bootstrap_interval(boot_sample)
+    uncertainty = {
+        'SPAM lower': lower[0],
+        'SPAM upper': upper[0],
+        'Avg. fidelity lower': lower[1],
+        'Avg. fidelity upper': upper[1]
     }
     return uncertainty
\ No newline at end of file
@@ -14,14 +14,16 @@
 
 ''' Functions for plotting bright state decay data from Quantinuum. '''
 
+from typing import Optional
+
 import pandas as pd
 import numpy as np
 from scipy.stats import sem
 import matplotlib.pyplot as plt
 
 from .decay_analysis_functions import bright_state_population, convert_metrics
-from .loading_functions import load_data
-from .zone_names import *
+from .loading_functions import load_data, survival_arrays
+from .zone_names import machine_labels
 
 
 def errorbar_plot(fid_info: dict,
@@ -29,14 +31,15 @@ def errorbar_plot(fid_info: dict,
                   machine: str,
                   date: str,
                   decay_type: str,
-                  log_scale=False):
+                  log_scale=False,
+                  data: Optional[dict] = None):
     ''' Plot bright state population and fitting. '''
 
-    data = load_data(data_dir, machine, date, decay_type)
+    if data is None:
+        data = load_data(data_dir, machine, date, decay_type)
     
     if len(fid_info) > 10:
-        cmap = plt.cm.turbo  # define the colormap
-        color_list = [cmap(i) for i in range(0, cmap.N, cmap.N//len(fid_info))]
+        color_list = plt.cm.turbo(np.linspace(0, 1, len(fid_info)))
     else:
         color_list = [plt.get_cmap("tab10").colors[i] for i in range(10)]
 
@@ -44,44 +47,33 @@ def errorbar_plot(fid_info: dict,
     legend = []
     c = 0
     for q, surv in data['survival'].items():
-        xvals = [int(l) for l in data['survival'][q]]
-        xrange = np.arange(np.min(xvals), np.max(xvals)+1)
+        xvals, counts = survival_arrays(surv)
+        xrange = np.arange(xvals[0], xvals[-1]+1)
 
         fit = convert_metrics(fid_info[q])
         survival_fit = bright_state_population(xrange, *fit)
         ax.plot(xrange, survival_fit, "-", color=color_list[c])
 
-        for length in xvals:
-            surv_freq = surv[str(length)]/data['shots']
-            ax.errorbar(
-                length,
-                surv_freq,
-                yerr=np.sqrt(surv_freq*(1 - surv_freq)/data['shots']),
-                fmt="o",
-                markersize=5,
-                capsize=3,
-                ecolor=color_list[c],
-                markerfacecolor=[1, 1, 1],
-                markeredgecolor=color_list[c],
-            )
+        surv_freq = counts/data['shots']
+        ax.errorbar(
+            xvals,
+            surv_freq,
+            yerr=np.sqrt(surv_freq*(1 - surv_freq)/data['shots']),
+            fmt="o",
+            markersize=5,
+            capsize=3,
+            ecolor=color_list[c],
+            markerfacecolor=[1, 1, 1],
+            markeredgecolor=color_list[c],
+        )
         legend.append(str(q))
         c += 1
 
-    ax.grid(b=True, axis="both", linestyle="--")
+    ax.grid(True, axis="both", linestyle="--")
     ax.set_xlabel("Sequence length (number of measurements)")
     ax.set_ylabel("Success counts")
 
-    if machine == 'H1-1':
-        try:
-            legend = [zone_labels_1[key] for key in legend]
-        except KeyError:
-            pass
-    if machine == 'H1-2':
-        try:
-            legend = [zone_labels_1[key] for key in legend]
-        except KeyError:
-            pass
-    ax.legend(legend)
+    ax.legend(machine_labels(machine, legend))
     if log_scale:
         ax.set_xscale("log")
 
@@ -91,45 +83,31 @@ def report(fid_info: dict,
            machine: str):
     ''' Returns DataFrame containing summary of results. '''
 
-    if machine == 'H1-1':
-        try:
-            fid_info = {zone_labels_1[key]: fid for key, fid in fid_info.items()}
-            boot_info = {zone_labels_1[key]: fid for key, fid in boot_info.items()}
-        except KeyError:
-            pass
-    if machine == 'H1-2':
-        try:
-            fid_info = {zone_labels_2[key]: fid for key, fid in fid_info.items()}
-            boot_info = {zone_labels_2[key]: fid for key, fid in boot_info.items()}
-        except KeyError:
-            pass
-
-    df1 = pd.DataFrame.from_dict(fid_info).transpose()
-    df1.rename(columns={0: 'Decay intercept', 1: 'Avg. infidelity'}, inplace=True)
-    boot_new = {
-        qname: {
-            'Decay intercept uncertainty': (qvals['SPAM upper'] - qvals['SPAM lower'])/2,
-            'Avg. infidelity uncertainty': (qvals['Avg. fidelity upper'] - qvals['Avg. fidelity lower'])/2
-        }
-        for qname, qvals in boot_info.items()
-    }
-    df2 = pd.DataFrame.from_dict(boot_new).transpose()
-    
-    result = pd.concat([df1, df2], axis=1).reindex(df1.index)
-    result.rename(columns={result.columns[0]: 'Qubits'})
-    result = result[['Avg. infidelity', 'Avg. infidelity uncertainty', 'Decay intercept', 'Decay intercept uncertainty']]
-    result.loc['Mean'] = result.mean()
-
-    # change uncertainties to geometric means
-    result['Decay intercept uncertainty']['Mean'] = sem(
-        result['Decay intercept uncertainty'].head(len(result['Decay intercept uncertainty']) - 1).to_list()
-    )
-    result['Avg. infidelity uncertainty']['Mean'] = sem(
-        result['Avg. infidelity uncertainty'].head(len(result['Avg. infidelity uncertainty']) - 1).to_list()
+    qubits = list(fid_info)
+    result = pd.DataFrame(
+        {
+            'Avg. infidelity': [fid_info[q][1] for q in qubits],
+            'Avg. infidelity uncertainty': [
+                (boot_info[q]['Avg. fidelity upper'] - boot_info[q]['Avg. fidelity lower'])/2
+                for q in qubits
+            ],
+            'Decay intercept': [fid_info[q][0] for q in qubits],
+            'Decay intercept uncertainty': [
+                (boot_info[q]['SPAM upper'] - boot_info[q]['SPAM lower'])/2
+                for q in qubits
+            ],
+        },
+        index=machine_labels(machine, qubits)
     )
 
-    result['Avg. infidelity'] = result['Avg. infidelity'].map(lambda x: 1 - x)
+    # uncertainties of the mean are standard errors of the uncertainties
+    values = result.to_numpy()
+    mean = values.mean(axis=0)
+    mean[[1, 3]] = sem(values[:, [1, 3]], axis=0)
+    result.loc['Mean'] = mean
+
+    result['Avg. infidelity'] = 1 - result['Avg. infidelity']
     pd.set_option('display.float_format', lambda x: '%.3E' % x)
-    result['Decay intercept'] = result['Decay intercept'].map(lambda x: 1 - x)
+    result['Decay intercept'] = 1 - result['Decay intercept']
 
     return result
\ No newline at end of file
@@ -0,0 +1,75 @@
+# Copyright 2022 Quantinuum (www.quantinuum.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+''' Functions for fitting many datasets to the same model at once. '''
+
+from math import erf, sqrt
+
+import numpy as np
+
+# upper quantile of a one-sigma basic bootstrap interval
+ONE_SIGMA_QUANTILE = 1/2 + erf(1/sqrt(2))/2
+
+
+def batched_curve_fit(fit_function,
+                      jacobian,
+                      xvals,
+                      yvals,
+                      p0,
+                      max_iter: int = 50,
+                      rtol: float = 1e-8):
+    ''' Least-squares fit of each row of yvals with Levenberg-Marquardt steps. '''
+
+    xvals = np.asarray(xvals, dtype=float)
+    yvals = np.asarray(yvals, dtype=float)
+    params = np.tile(np.asarray(p0, dtype=float), (yvals.shape[0], 1))
+
+    resid = yvals - fit_function(xvals, *params.T[:, :, None])
+    cost = np.sum(resid**2, axis=1)
+    damping = np.full(len(params), 1e-3)
+    for _ in range(max_iter):
+        args = params.T[:, :, None]
+        jac = np.stack(np.broadcast_arrays(*jacobian(xvals, *args)), axis=1)
+
+        # damped normal equations for every row solved as one stacked system
+        jtj = jac @ jac.transpose(0, 2, 1)
+        jtr = jac @ resid[:, :, None]
+        scale = damping[:, None, None] * np.eye(params.shape[1]) * jtj
+        step = np.linalg.solve(jtj + scale, jtr)[:, :, 0]
+
+        trial = params + step
+        trial_resid = yvals - fit_function(xvals, *trial.T[:, :, None])
+        trial_cost = np.sum(trial_resid**2, axis=1)
+        accept = trial_cost <= cost
+        params[accept] = trial[accept]
+        resid[accept] = trial_resid[accept]
+        cost[accept] = trial_cost[accept]
+        damping = np.where(accept, damping/10, damping*10)
+
+        if np.all(np.abs(step) <= rtol * (np.abs(params) + rtol)):
+            break
+
+    return params
+
+
+def basic_bootstrap_interval(samples):
+    ''' One-sigma basic bootstrap (lower, upper) bounds for each column. '''
+
+    samples = np.asarray(samples)
+    quantiles = np.quantile(
+        samples,
+        [ONE_SIGMA_QUANTILE, 1 - ONE_SIGMA_QUANTILE],
+        axis=0
+    )
+    return 2*samples.mean(axis=0) - quantiles
@@ -15,12 +15,52 @@
 ''' Functions for loading RB data from Quantinuum. '''
 
 import json
+from functools import lru_cache
 
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+@lru_cache(maxsize=32)
 def load_data(data_dir, machine, date, data_type):
+    ''' Load experiment data (cached, do not mutate the returned dict). '''
 
     file_name = f'{machine}/{date}/{data_type}.json'
 
-    with open(data_dir.joinpath(file_name), 'r') as f:
-        data = json.load(f)
+    if orjson is not None:
+        with open(data_dir.joinpath(file_name), 'rb') as f:
+            data = orjson.loads(f.read())
+    else:
+        with open(data_dir.joinpath(file_name), 'r') as f:
+            data = json.load(f)
 
     return data
+
+
+def survival_arrays(survival: dict):
+    ''' Convert {length: counts} survival dict to sorted numpy arrays. '''
+
+    xvals = np.array(sorted(int(m) for m in survival), dtype=np.int64)
+    counts = np.array([survival[str(m)] for m in xvals], dtype=np.int64)
+
+    return xvals, counts
+
+
+def survival_tensor(survival: dict):
+    ''' Convert {group: {length: {rep: counts}}} RB survival to a dense array. '''
+
+    groups = list(survival)
+    first = survival[groups[0]]
+    xvals = np.array(sorted(int(m) for m in first), dtype=np.int64)
+    reps = [str(r) for r in range(len(first[str(xvals[0])]))]
+    counts = np.fromiter(
+        (survival[q][str(m)][r] for q in groups for m in xvals for r in reps),
+        dtype=np.int64,
+        count=len(groups)*len(xvals)*len(reps)
+    ).reshape(len(groups), len(xvals), len(reps))
+
+    return groups, xvals, counts
@@ -14,60 +14,107 @@
 
 ''' Functions for analyzing RB data from Quantinuum. '''
 
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from typing import Optional
 import json
 
 import numpy as np
 from scipy.optimize import curve_fit
-from scipy.special import  erf
 
-from .loading_functions import load_data
+from .fitting_functions import basic_bootstrap_interval, batched_curve_fit
+from .loading_functions import load_data, survival_tensor
+
+_rng = np.random.default_rng()
+
 
 def rb_analysis(data_dir: str,
                 machine: str, 
                 date: str, 
-                rb_type: str):
+                rb_type: str,
+                seed: Optional[int] = None,
+                max_workers: Optional[int] = 1,
+                resamples: int = 1000,
+                tolerance: Optional[float] = None):
     ''' Analyze RB data and return DataFrame of results. '''
 
     data = load_data(data_dir, machine, date, rb_type)
+    groups, xvals, counts = survival_tensor(data['survival'])
+
+    # independent random streams so results don't depend on max_workers
+    rngs = [
+        np.random.default_rng(s)
+        for s in np.random.SeedSequence(seed).spawn(len(groups))
+    ]
+    analyze = partial(
+        _analyze_group,
+        xvals=xvals,
+        shots=data['shots'],
+        resamples=resamples,
+        tolerance=tolerance
+    )
+    args = (groups, counts, rngs)
+    if max_workers == 1:
+        results = list(map(analyze, *args))
+    else:
+        with ProcessPoolExecutor(max_workers) as executor:
+            results = list(executor.map(analyze, *args))
 
     fit_info = {}
     boot_info = {}
-    for q in data['survival']:
-        xvals = list(data['survival'][q].keys())
-        yvals = [
-            np.mean(list(vals.values()))/data['shots']
-            for vals in data['survival'][q].values()
-        ]
-        fit_info[q] = expoential_fit(
-            xvals, 
-            yvals,
-            len(q.split(','))
-        )
-        boot_info[q] = bootstrap(
-            data['survival'][q], 
-            data['shots'], 
-            len(q.split('-'))
-        )
+    for q, fit, boot in results:
+        fit_info[q] = fit
+        boot_info[q] = boot
     return fit_info, boot_info
 
 
-def expoential_fit(seq_lengths: list,
-                   survival_means: list,
+def _analyze_group(q: str,
+                   counts: np.ndarray,
+                   rng: np.random.Generator,
+                   xvals: np.ndarray,
+                   shots: int,
+                   resamples: int = 1000,
+                   tolerance: Optional[float] = None):
+    ''' Fit and bootstrap the RB survival of a single qubit group. '''
+
+    yvals = counts.mean(axis=1)/shots
+    nqubits = len(q.split(','))
+    fit = expoential_fit(
+        xvals, 
+        yvals,
+        nqubits
+    )
+    boot = bootstrap(
+        xvals,
+        counts,
+        shots, 
+        nqubits,
+        resamples=resamples,
+        rng=rng,
+        tolerance=tolerance
+    )
+    return q, fit, boot
+
+
+def expoential_fit(seq_lengths: np.ndarray,
+                   survival_means: np.ndarray,
                    nqubits: int,
                    initial_guess: Optional[list] = None):
     ''' Fits survival to exponential decay with asymoptote. '''
 
+    asympt = 1/2**nqubits
     if not initial_guess:
-        initial_guess = [1 - 1/2**nqubits, 0.99]
+        initial_guess = [1 - asympt, 0.99]
 
-    fit_function = lambda x, A, r: exponential_with_asymptote(x, A, r, 1/2**nqubits)
+    fit_function = lambda x, A, r: exponential_with_asymptote(x, A, r, asympt)
 
     fit_res = curve_fit(
         fit_function,
-        seq_lengths,
-        survival_means,
+        np.asarray(seq_lengths, dtype=np.float64),
+        np.asarray(survival_means, dtype=np.float64),
         initial_guess,
+        check_finite=False,
+        jac=lambda x, A, r: np.column_stack(exponential_jacobian(x, A, r))
     )
     metrics = convert_params(
         fit_res[0],
@@ -85,9 +132,10 @@ def convert_params(fit_params,
     else:
         ntq = 1
 
+    dim = 2**nqubits
     out = [
-        fit_params[0] + 1/2**nqubits,
-        ((2**nqubits - 1) * fit_params[1] ** (1 / ntq) + 1)/2**nqubits
+        fit_params[0] + 1/dim,
+        ((dim - 1) * fit_params[1] ** (1 / ntq) + 1)/dim
     ]
     return out
 
@@ -101,14 +149,15 @@ def convert_metrics(metrics_params,
     else:
         ntq = 1
 
+    dim = 2**nqubits
     out = [
-        metrics_params[0] - 1/2**nqubits,
-        ((2**nqubits * metrics_params[1] - 1)/(2**nqubits - 1))**ntq
+        metrics_params[0] - 1/dim,
+        ((dim * metrics_params[1] - 1)/(dim - 1))**ntq
     ]
     return out
 
 
-def exponential_with_asymptote(seq_len: list, 
+def exponential_with_asymptote(seq_len: np.ndarray,
                                A: float,
                                r: float,
                                asympt: int):
@@ -119,54 +168,92 @@ def exponential_with_asymptote(seq_len: list,
     return survival_prob
 
 
-def bootstrap(survival,
-              shots,
-              nqubits,
-              resamples: int = 1000):
+def exponential_jacobian(seq_len: np.ndarray,
+                         A: float,
+                         r: float):
+    ''' Derivatives of the RB survival equation w.r.t. A and r. '''
+
+    return r ** seq_len, A * seq_len * r ** (seq_len - 1)
+
+
+def bootstrap(xvals: np.ndarray,
+              counts: np.ndarray,
+              shots: int,
+              nqubits: int,
+              resamples: int = 1000,
+              rng: Optional[np.random.Generator] = None,
+              tolerance: Optional[float] = None,
+              block_size: int = 200):
     ''' Semi-parameteric bootstrap RB data. '''
 
-    xvals = [int(m) for m in survival]
-    reps = len(survival[str(xvals[0])])
-    boot_sample = {
-        'SPAM': [],
-        'Avg. fidelity': []
-    }
-    for _ in range(resamples):
-        resampled_reps = np.random.choice(
-            np.arange(reps),
-            size=(len(xvals), reps),
-            replace=True
-        )
-        sampled_vals = [
-            [
-                survival[str(l)][str(r)]/shots
-                for r in resampled_reps[i]
-            ]
-            for i, l in enumerate(xvals)
-        ]
-        resampled_vals = np.random.binomial(
-            shots, 
-            sampled_vals
-        )/shots
-        yvals = [
-            np.mean(vals)
-            for vals in resampled_vals
-        ]
-        metrics = expoential_fit(
-            xvals, 
-            yvals,
-            nqubits
-        )
-        boot_sample['SPAM'].append(metrics[0])
-        boot_sample['Avg. fidelity'].append(metrics[1])
-
-    thresh = 1/2 + erf(1/np.sqrt(2))/2
+    if rng is None:
+        rng = _rng
+
+    # all resamples start from the fit to the measured data
+    p0 = convert_metrics(
+        expoential_fit(xvals, counts.mean(axis=1)/shots, nqubits),
+        nqubits
+    )
+
+    # with a tolerance, resample in blocks until the interval widths settle
+    if tolerance is None:
+        block_size = resamples
+    boot_sample = np.empty((0, 2))
+    half_width = None
+    while len(boot_sample) < resamples:
+        size = min(block_size, resamples - len(boot_sample))
+        boot_sample = np.vstack([
+            boot_sample,
+            _resample_metrics(xvals, counts, shots, nqubits, p0, size, rng)
+        ])
+        lower, upper = basic_bootstrap_interval(boot_sample)
+        previous, half_width = half_width, (upper - lower)/2
+        if previous is not None and np.all(
+            np.abs(half_width - previous) <= tolerance * np.abs(previous)
+        ):
+            break
+
     uncertainty = {}
-    for param, vals in boot_sample.items():
-        uncertainty[param + ' lower'] = (
-            2*np.mean(vals) - np.quantile(vals, thresh)
-        )
-        uncertainty[param + ' upper'] = (
-            2*np.mean(vals) - np.quantile(vals, 1-thresh)
-        )
+    for i, param in enumerate(['SPAM', 'Avg. fidelity']):
+        uncertainty[param + ' lower'] = lower[i]
+        uncertainty[param + ' upper'] = upper[i]
     return uncertainty
+
+
+def _resample_metrics(xvals: np.ndarray,
+                      counts: np.ndarray,
+                      shots: int,
+                      nqubits: int,
+                      p0: list,
+                      resamples: int,
+                      rng: np.random.Generator):
+    ''' Fit resampled RB data and return (SPAM, avg. fidelity) per resample. '''
+
+    reps = counts.shape[1]
+
+    # draw every resample at once, shape (resamples, lengths, reps)
+    resampled_reps = rng.integers(
+        0,
+        reps,
+        size=(resamples, len(xvals), reps)
+    )
+    sampled_vals = np.take_along_axis(
+        counts[np.newaxis],
+        resampled_reps,
+        axis=2
+    )/shots
+    resampled_vals = rng.binomial(
+        shots, 
+        sampled_vals
+    )/shots
+    resampled_means = resampled_vals.mean(axis=2)
+
+    asympt = 1/2**nqubits
+    fit_params = batched_curve_fit(
+        lambda x, A, r: exponential_with_asymptote(x, A, r, asympt),
+        exponential_jacobian,
+        xvals,
+        resampled_means,
+        p0
+    )
+    return np.column_stack(convert_params(fit_params.T, nqubits))
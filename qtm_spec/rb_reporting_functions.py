@@ -20,7 +20,7 @@ from scipy.stats import sem
 import matplotlib.pyplot as plt
 
 from .rb_analysis_functions import exponential_with_asymptote, convert_metrics
-from .zone_names import *
+from .zone_names import machine_labels
 
 def errorbar_plot(fid_info: dict,
                   data: dict,
@@ -50,39 +50,27 @@ def errorbar_plot(fid_info: dict,
         )
         ax.plot(xrange, survival_fit, "-", color=color_list[i])
 
-        for length in xvals:
-            surv = [
-                val/data['shots']
-                for val in data['survival'][q][str(length)].values()
-            ]
-            ax.errorbar(
-                length,
-                np.mean(surv),
-                yerr=sem(surv),
-                fmt="o",
-                markersize=5,
-                capsize=3,
-                ecolor=color_list[i],
-                markerfacecolor=[1, 1, 1],
-                markeredgecolor=color_list[i],
-            )
+        surv = np.array([
+            list(data['survival'][q][str(length)].values())
+            for length in xvals
+        ])/data['shots']
+        ax.errorbar(
+            xvals,
+            surv.mean(axis=1),
+            yerr=sem(surv, axis=1),
+            fmt="o",
+            markersize=5,
+            capsize=3,
+            ecolor=color_list[i],
+            markerfacecolor=[1, 1, 1],
+            markeredgecolor=color_list[i],
+        )
         legend.append(str(q))
 
-    ax.grid(b=True, axis="both", linestyle="--")
+    ax.grid(True, axis="both", linestyle="--")
     ax.set_xlabel("Sequence length (number of Cliffords)")
     ax.set_ylabel("Avg. Survival")
-
-    if machine == 'H1-1':
-        try:
-            legend = [zone_labels_1[key] for key in legend]
-        except KeyError:
-            pass
-    if machine == 'H1-2':
-        try:
-            legend = [zone_labels_2[key] for key in legend]
-        except KeyError:
-            pass
-    ax.legend(legend)
+    ax.legend(machine_labels(machine, legend))
     if log_scale:
         ax.set_xscale("log")
 
@@ -92,45 +80,26 @@ def report(fid_info: dict,
            machine: str):
     ''' Returns DataFrame containing summary of results. '''
 
-    if machine == 'H1-1':
-        try:
-            fid_info = {zone_labels_1[key]: fid for key, fid in fid_info.items()}
-            boot_info = {zone_labels_1[key]: fid for key, fid in boot_info.items()}
-        except KeyError:
-            pass
-    if machine == 'H1-2':
-        try:
-            fid_info = {zone_labels_2[key]: fid for key, fid in fid_info.items()}
-            boot_info = {zone_labels_2[key]: fid for key, fid in boot_info.items()}
-        except KeyError:
-            pass
-
-    df1 = pd.DataFrame.from_dict(fid_info).transpose()
-    df1.rename(columns={0: 'RB intercept', 1: 'Avg. infidelity'}, inplace=True)
-
-    boot_new = {
-        qname: {
-            'RB intercept uncertainty': (qvals['SPAM upper'] - qvals['SPAM lower'])/2,
-            'Avg. infidelity uncertainty': (qvals['Avg. fidelity upper'] - qvals['Avg. fidelity lower'])/2
-        }
-        for qname, qvals in boot_info.items()
-    }
-    df2 = pd.DataFrame.from_dict(boot_new).transpose()
-    
-    result = pd.concat([df1, df2], axis=1).reindex(df1.index)
-    result.rename(columns={result.columns[0]: 'Qubits'})
-    result = result[['Avg. infidelity', 'Avg. infidelity uncertainty', 'RB intercept', 'RB intercept uncertainty']]
-    result.loc['Mean'] = result.mean()
+    qubits = list(fid_info)
+    values = np.array([
+        [
+            fid_info[q][1],
+            (boot_info[q]['Avg. fidelity upper'] - boot_info[q]['Avg. fidelity lower'])/2,
+            fid_info[q][0],
+            (boot_info[q]['SPAM upper'] - boot_info[q]['SPAM lower'])/2
+        ]
+        for q in qubits
+    ])
+    values[:, [0, 2]] = 1 - values[:, [0, 2]]
+    result = pd.DataFrame(
+        np.vstack([values, values.mean(axis=0)]),
+        index=machine_labels(machine, qubits) + ['Mean'],
+        columns=['Avg. infidelity', 'Avg. infidelity uncertainty', 'RB intercept', 'RB intercept uncertainty']
+    )
 
     # change uncertainties to standard error in means
-    result['RB intercept uncertainty']['Mean'] = sem(
-        result['RB intercept uncertainty'].head(len(result['RB intercept uncertainty']) - 1).to_list()
-    )
-    result['Avg. infidelity uncertainty']['Mean'] = sem(
-        result['Avg. infidelity uncertainty'].head(len(result['Avg. infidelity uncertainty']) - 1).to_list()
-    )
-    result['Avg. infidelity'] = result['Avg. infidelity'].map(lambda x: 1 - x)
+    result.at['Mean', 'RB intercept uncertainty'] = sem(values[:, 3])
+    result.at['Mean', 'Avg. infidelity uncertainty'] = sem(values[:, 1])
     pd.set_option('display.float_format', lambda x: '%.3E' % x)
-    result['RB intercept'] = result['RB intercept'].map(lambda x: 1 - x)
 
     return result
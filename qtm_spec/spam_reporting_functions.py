@@ -21,7 +21,7 @@ import matplotlib.pyplot as plt
 
 from .decay_analysis_functions import bright_state_population, convert_metrics
 from .loading_functions import load_data
-from .zone_names import *
+from .zone_names import machine_labels
 
 
 def report(data_dir: str,
@@ -31,59 +31,30 @@ def report(data_dir: str,
     ''' Returns DataFrame containing summary of results. '''
 
     data = load_data(data_dir, machine, date, experiment)
-    spam_results = data['survival']
 
-    if machine == 'H1-1':
-        try:
-            spam_results = {
-                zone_labels_1[key]: {
-                    s: f/data['shots'] 
-                    for s, f in fid.items()
-                }
-                for key, fid in spam_results.items()
-            }
-
-        except KeyError:
-            pass
-    if machine == 'H1-2':
-        try:
-            spam_results = {
-                zone_labels_2[key]: {
-                    s: f/data['shots'] 
-                    for s, f in fid.items()
-                }
-                for key, fid in spam_results.items()
-            }
-
-        except KeyError:
-            pass
-
-    df1 = pd.DataFrame.from_dict(spam_results).transpose()
-    df1.rename(columns={'0': '0 SPAM error', '1': '1 SPAM error'}, inplace=True)
-
-    avg = {
-        q: {
-            'Avg. SPAM error': (res['0'] + res['1'])/2,
-            'Avg. SPAM error uncertainty': np.sqrt(res['0']*(1 - res['0']) + res['1']*(1 - res['1']))/2/np.sqrt(data['shots'])
-        }
-        for q, res in spam_results.items()
-    }
-    df2 = pd.DataFrame.from_dict(avg).transpose()
-    
-    result = pd.concat([df1, df2], axis=1).reindex(df1.index)
-    result.rename(columns={result.columns[0]: 'Qubits'})
-    result.loc['Mean'] = result.mean()
-
-    # change uncertainties to geometric means
-    result['Avg. SPAM error uncertainty']['Mean'] = sem(
-        result['Avg. SPAM error uncertainty'].head(len(result['Avg. SPAM error uncertainty']) - 1).to_list()
+    qubits = list(data['survival'])
+    success = np.array([
+        [data['survival'][q]['0'], data['survival'][q]['1']]
+        for q in qubits
+    ])/data['shots']
+    avg_uncertainty = np.sqrt(
+        np.sum(success*(1 - success), axis=1)
+    )/2/np.sqrt(data['shots'])
+    values = np.column_stack([
+        1 - success.mean(axis=1),
+        avg_uncertainty,
+        1 - success
+    ])
+
+    # change uncertainties to standard error in means
+    mean = values.mean(axis=0)
+    mean[1] = sem(avg_uncertainty)
+
+    result = pd.DataFrame(
+        np.vstack([values, mean]),
+        index=machine_labels(machine, qubits) + ['Mean'],
+        columns=['Avg. SPAM error', 'Avg. SPAM error uncertainty', '0 SPAM error', '1 SPAM error']
     )
-
-    result['Avg. SPAM error'] = result['Avg. SPAM error'].map(lambda x: 1 - x)
-    result['0 SPAM error'] = result['0 SPAM error'].map(lambda x: 1 - x)
-    result['1 SPAM error'] = result['1 SPAM error'].map(lambda x: 1 - x)
     pd.set_option('display.float_format', lambda x: '%.3E' % x)
 
-    result = result[['Avg. SPAM error', 'Avg. SPAM error uncertainty', '0 SPAM error', '1 SPAM error']]
-
-    return result
\ No newline at end of file
+    return result
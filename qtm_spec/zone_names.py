@@ -14,31 +14,158 @@
 
 ''' Zone naming conventions. '''
 
-zone_labels_1 = {
-    '0, 1': 'G1',
-    '2, 3': 'G2',
-    '4, 5': 'G3',
-    '6, 7': 'G4',
-    '8, 9': 'G5',
-    '0': 'G1-left',
-    '1': 'G1-right',
-    '2': 'G2-left',
-    '3': 'G2-right',
-    '4': 'G3-left',
-    '5': 'G3-right',
-    '6': 'G4-left',
-    '7': 'G4-right',
-    '8': 'G5-left',
-    '9': 'G5-right',
+import sys
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Sequence, Tuple
+
+__all__ = [
+    'PAIRS',
+    'SINGLES',
+    'label',
+    'group_label',
+    'side_label',
+    'indices_for',
+    'zone_labels',
+    'zone_labels_1',
+    'zone_labels_2',
+    'machine_zones',
+    'machine_zone_labels',
+    'machine_labels',
+]
+
+
+def _freeze(labels: dict):
+    ''' Read-only copy of a label table with its strings interned. '''
+
+    return MappingProxyType({
+        sys.intern(key) if isinstance(key, str) else key: sys.intern(label)
+        for key, label in labels.items()
+    })
+
+
+# gate zones of each zone, in qubit order
+_GROUPS = {
+    1: ('G1', 'G2', 'G3', 'G4', 'G5'),
+    2: ('G2', 'G3', 'G4'),
+}
+_L = sys.intern('-left')
+_R = sys.intern('-right')
+
+# labels of each zone's gate zones and of their sides, indexed by zone - 1
+PAIRS = tuple(
+    tuple(map(sys.intern, _GROUPS[zone]))
+    for zone in sorted(_GROUPS)
+)
+SINGLES = tuple(
+    tuple(sys.intern(group + side) for group in _GROUPS[zone] for side in (_L, _R))
+    for zone in sorted(_GROUPS)
+)
+
+
+def label(zone: int, i: int, paired: bool) -> str:
+    ''' Label of qubit i, or of the gate zone holding it if paired. '''
+
+    if paired:
+        if zone < 1 or i < 0:
+            raise IndexError(f'no label for zone {zone}, qubit {i}')
+        return PAIRS[zone - 1][i >> 1]
+    return side_label(zone, i)
+
+
+def _build_labels() -> Dict[Tuple[int, Tuple[int, ...]], str]:
+    ''' Label every qubit pair and single qubit of each zone. '''
+
+    labels = {}
+    for zone, (pairs, singles) in enumerate(zip(PAIRS, SINGLES), 1):
+        for i, pair_label in enumerate(pairs):
+            labels[zone, (2*i, 2*i + 1)] = pair_label
+        for i, single_label in enumerate(singles):
+            labels[zone, (i,)] = single_label
+    return labels
+
+
+# labels keyed by (zone, qubit indices)
+_LABELS = _freeze(_build_labels())
+
+# qubit indices keyed by (zone, label)
+_INVERSE = MappingProxyType({
+    (zone, label): idx for (zone, idx), label in _LABELS.items()
+})
+
+
+def group_label(zone: int, pair: Sequence[int]) -> str:
+    ''' Label of the gate zone holding a pair of qubits. '''
+
+    return _LABELS[zone, tuple(pair)]
+
+
+def side_label(zone: int, idx: int) -> str:
+    ''' Label of the side of a gate zone holding a single qubit. '''
+
+    # index the tuple directly, without letting negative values wrap around
+    if zone < 1 or idx < 0:
+        raise IndexError(f'no label for zone {zone}, qubit {idx}')
+    return SINGLES[zone - 1][idx]
+
+
+def indices_for(zone: int, label: str) -> Tuple[int, ...]:
+    ''' Qubit indices of a gate zone or side label. '''
+
+    return _INVERSE[zone, label]
+
+
+@lru_cache(maxsize=None)
+def zone_labels(zone: int):
+    ''' Read-only view of a zone's labels keyed by strings like '0, 1'. '''
+
+    return _freeze({
+        ', '.join(map(str, idx)): label
+        for (key_zone, idx), label in _LABELS.items()
+        if key_zone == zone
+    })
+
+
+machine_zones = {
+    'H1-1': 1,
+    'H1-2': 2,
 }
-zone_labels_2 = {
-    '0, 1': 'G2',
-    '2, 3': 'G3',
-    '4, 5': 'G4',
-    '0': 'G2-left',
-    '1': 'G2-right',
-    '2': 'G3-left',
-    '3': 'G3-right',
-    '4': 'G4-left',
-    '5': 'G4-right',
+
+# string-keyed tables kept for older callers, built on first access
+_COMPAT_TABLES = {
+    'zone_labels_1': 1,
+    'zone_labels_2': 2,
 }
+
+
+def __getattr__(name: str):
+    ''' Build the string-keyed label tables lazily. '''
+
+    if name in _COMPAT_TABLES:
+        table = zone_labels(_COMPAT_TABLES[name])
+    elif name == 'machine_zone_labels':
+        table = MappingProxyType({
+            machine: zone_labels(zone) for machine, zone in machine_zones.items()
+        })
+    else:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    # later lookups find the table in the module dict and skip this hook
+    globals()[name] = table
+    return table
+
+
+def _parse_key(key: str) -> Tuple[int, ...]:
+    ''' Qubit indices of a result key like '0, 1' or '0'. '''
+
+    return tuple(int(idx) for idx in key.split(','))
+
+
+def machine_labels(machine: str, keys) -> list:
+    ''' Zone labels for result keys, or the keys if any has no label. '''
+
+    zone = machine_zones.get(machine)
+    try:
+        return [_LABELS[zone, _parse_key(key)] for key in keys]
+    except (KeyError, ValueError):
+        return list(keys)